@@ -0,0 +1,40 @@
+"""create appointments table
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-15 00:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '0001'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'appointments',
+        sa.Column('id', sa.String(), primary_key=True),
+        sa.Column('name', sa.String(), nullable=False),
+        sa.Column('email', sa.String(), nullable=False),
+        sa.Column('appointment_time', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('status', sa.String(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=True),
+        sa.UniqueConstraint('appointment_time', name='_appointment_time_uc'),
+        if_not_exists=True,
+    )
+    op.create_index('ix_appointments_id', 'appointments', ['id'], if_not_exists=True)
+    op.create_index('ix_appt_status_time', 'appointments', ['status', 'appointment_time'], if_not_exists=True)
+    op.create_index('ix_appt_pending', 'appointments', ['appointment_time'],
+                    postgresql_where=sa.text("status = 'pending'"), if_not_exists=True)
+
+
+def downgrade():
+    op.drop_index('ix_appt_pending', table_name='appointments')
+    op.drop_index('ix_appt_status_time', table_name='appointments')
+    op.drop_index('ix_appointments_id', table_name='appointments')
+    op.drop_table('appointments')
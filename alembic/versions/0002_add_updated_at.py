@@ -0,0 +1,29 @@
+"""add appointments.updated_at
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-15 00:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '0002'
+down_revision = '0001'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # IF NOT EXISTS: tables built by create_all (AUTO_CREATE_TABLES=1) already have the column
+    op.execute("ALTER TABLE appointments ADD COLUMN IF NOT EXISTS updated_at TIMESTAMP WITH TIME ZONE DEFAULT now()")
+    # Indexes for the list ETag aggregates (MAX(updated_at), per-status COUNT(*))
+    op.create_index('ix_appt_updated_at', 'appointments', ['updated_at'], if_not_exists=True)
+    op.create_index('ix_appt_status_updated', 'appointments', ['status', 'updated_at'], if_not_exists=True)
+
+
+def downgrade():
+    op.drop_index('ix_appt_status_updated', table_name='appointments')
+    op.drop_index('ix_appt_updated_at', table_name='appointments')
+    op.drop_column('appointments', 'updated_at')
@@ -0,0 +1,34 @@
+"""add business hours check constraint
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-15 00:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '0003'
+down_revision = '0002'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Skipped when create_all (AUTO_CREATE_TABLES=1) already built the constraint from the model.
+    # NOT VALID: enforce for new writes without failing on rows booked before the rule existed
+    op.execute(
+        "DO $$ BEGIN "
+        "IF NOT EXISTS (SELECT 1 FROM pg_constraint WHERE conname = 'appt_business_hours') THEN "
+        "ALTER TABLE appointments ADD CONSTRAINT appt_business_hours CHECK ("
+        "extract(minute from appointment_time AT TIME ZONE 'Asia/Kolkata') = 0 "
+        "AND extract(hour from appointment_time AT TIME ZONE 'Asia/Kolkata') BETWEEN 9 AND 18"
+        ") NOT VALID; "
+        "END IF; "
+        "END $$"
+    )
+
+
+def downgrade():
+    op.drop_constraint('appt_business_hours', 'appointments', type_='check')
@@ -1,8 +1,12 @@
 import google.generativeai as genai
 from google.generativeai import types
+import asyncio
 import json
 import os
-import requests
+import re
+import httpx
+from collections import OrderedDict
+from aioconsole import ainput
 from datetime import datetime, timedelta
 from dotenv import load_dotenv # Import load_dotenv
 
@@ -11,6 +15,13 @@ load_dotenv()
 
 fastapi_url = "http://127.0.0.1:8000"
 
+# Shared client so every tool call reuses the same keep-alive connection
+_http = httpx.AsyncClient(
+    base_url=fastapi_url,
+    timeout=httpx.Timeout(10.0),
+    limits=httpx.Limits(max_connections=20, keepalive_expiry=60),
+)
+
 
 if not GEMINI_API_KEY:
     raise ValueError("GEMINI_API_KEY not found in environment variables. Please check your .env file.")
@@ -40,7 +51,7 @@ create_appointment = {
             "appointment_time":{
                 "type" : "string",
                 "format" : "date-time",
-                "description": "Appointment time of the customer in ISO 8601 format."
+                "description": "Appointment time of the customer in ISO 8601 format, in IST (e.g. 2025-07-22T10:00:00+05:30)."
             },
             "status":{
                 "type":"string",
@@ -52,38 +63,96 @@ create_appointment = {
     }
 }
 
-def create_appointment_in_fastapi( id: str, name: str, email:str, appointment_time: str, status: str = "pending"):
-    """ Calls the fastapi /create endpoint to make a new appointment.
-    This function sends a POST request to the FastAPI server with the appointment details.
-    """
-    payload = {
-        "id" : id,
-        "name": name,
-        "email": email,
-        "appointment_time": appointment_time,
-        "status": status
+create_appointments_bulk = {
+    "name": "create_appointments_bulk_in_fastapi",
+    "description": "Create several appointments in FastAPI with a single request. Use this when the user asks to book more than one slot.",
+    "parameters": {
+        "type": "object",
+        "properties": {
+            "appointments": {
+                "type": "array",
+                "description": "The appointments to create.",
+                "items": create_appointment["parameters"]
+            }
+        },
+        "required": ["appointments"]
     }
+}
 
-    headers = {
-        "Content-Type": "application/json"
-    }
+def error_detail(response: httpx.Response) -> str:
+    """ Extracts a readable message from a FastAPI error response. Validation errors (422)
+    carry a list of error dicts, so their messages are joined.
+    """
+    try:
+        detail = response.json().get('detail', response.text)
+    except ValueError:
+        return response.text
+    if isinstance(detail, list):
+        return " ".join(item.get('msg', '').removeprefix('Value error, ') for item in detail)
+    return str(detail)
 
+async def post_to_fastapi(path: str, payload):
+    """ POSTs a JSON payload to the FastAPI server and returns the decoded response,
+    or a dict with an 'error' message Gemini can relay to the user.
+    """
     try:
-        response = requests.post(f"{fastapi_url}/create", json=payload, headers=headers)
+        response = await _http.post(path, json=payload)
         response.raise_for_status()
         return response.json()
-    except requests.exceptions.HTTPError as e:
+    except httpx.HTTPStatusError as e:
         print(f"HTTP Error calling FastAPI: {e.response.status_code} - {e.response.text}")
-        return {"error": f"Failed to create appointment : {e.response.json().get('detail',e.response.text )}" }
-    except requests.exceptions.ConnectionError as e:
+        return {"error": f"Failed to create appointment : {error_detail(e.response)}" }
+    except httpx.ConnectError as e:
         print(f"Connection Error: Could not connect to FastAPI server at {fastapi_url}. Is it running?")
         return {"error": "Could not connect to the appointment service. Please ensure the backend is running."}
     except Exception as e:
         print(f"An unexpected error occurred: {e}")
         return {"error": f"An unexpected error occurred: {e}"}
 
+async def create_appointment_in_fastapi( id: str, name: str, email:str, appointment_time: str, status: str = "pending"):
+    """ Calls the fastapi /create endpoint to make a new appointment.
+    This function sends a POST request to the FastAPI server with the appointment details.
+    """
+    payload = {
+        "id" : id,
+        "name": name,
+        "email": email,
+        "appointment_time": appointment_time,
+        "status": status
+    }
+
+    return await post_to_fastapi("/create", payload)
+
+async def create_appointments_bulk_in_fastapi(appointments: list):
+    """ Calls the fastapi /create_bulk endpoint to make several appointments in one request.
+    Appointments whose id or time slot is already taken are reported back as skipped.
+    """
+    payload = [{"status": "pending", **appointment} for appointment in appointments]
+    return await post_to_fastapi("/create_bulk", payload)
+
+def format_tool_reply(tool_response: dict) -> str:
+    """ Builds the user-facing reply for a create_appointment_in_fastapi result. """
+    if "error" in tool_response:
+        return f"Sorry, I couldn't book that appointment. {tool_response['error']}"
+    return f"{tool_response.get('message', 'Appointment created successfully')} (ID: {tool_response.get('appointment_id')})."
+
+def format_bulk_tool_reply(tool_response: dict) -> str:
+    """ Builds the user-facing reply for a create_appointments_bulk_in_fastapi result. """
+    if "error" in tool_response:
+        return f"Sorry, I couldn't book those appointments. {tool_response['error']}"
+    reply = f"Booked {len(tool_response['created'])} appointment(s) (IDs: {', '.join(tool_response['created']) or 'none'})."
+    if tool_response["skipped"]:
+        reply += f" Skipped {', '.join(tool_response['skipped'])} because the ID or time slot is already taken."
+    return reply
+
+# Tool name -> (handler, reply formatter)
+TOOL_HANDLERS = {
+    "create_appointment_in_fastapi": (create_appointment_in_fastapi, format_tool_reply),
+    "create_appointments_bulk_in_fastapi": (create_appointments_bulk_in_fastapi, format_bulk_tool_reply),
+}
+
 create_Appoint = types.Tool(
-    function_declarations=[create_appointment]
+    function_declarations=[create_appointment, create_appointments_bulk]
 )
 
 model = genai.GenerativeModel(
@@ -91,54 +160,122 @@ model = genai.GenerativeModel(
     tools=[create_Appoint]
 )
 
-def chat_with_gemini():
+# --- Response cache for repeated opening prompts ---
+# Only the first turn of a chat is cached: it is the one prompt whose answer can't depend on
+# history (later replies such as a name or a time only make sense in context)
+RESPONSE_CACHE_SIZE = 512
+
+_response_cache = OrderedDict()
+
+def normalize_prompt(message: str) -> str:
+    return " ".join(re.findall(r"[a-z0-9']+", message.lower()))
+
+def get_cached_response(prompt: str):
+    text = _response_cache.get(prompt)
+    if text is not None:
+        _response_cache.move_to_end(prompt)
+    return text
+
+def cache_response(prompt: str, text: str):
+    _response_cache[prompt] = text
+    _response_cache.move_to_end(prompt)
+    if len(_response_cache) > RESPONSE_CACHE_SIZE:
+        _response_cache.popitem(last=False)
+
+def append_history(chat, *contents):
+    """ Adds turns the model did not produce through chat.send_message to the chat history. """
+    chat.history = [*chat.history, *contents]
+
+def user_text(text: str):
+    return genai.protos.Content(role="user", parts=[genai.protos.Part(text=text)])
+
+def model_text(text: str):
+    return genai.protos.Content(role="model", parts=[genai.protos.Part(text=text)])
+
+async def chat_with_gemini():
     chat=model.start_chat()
     print("Welcome to the Appointment Booking System!")
     print("You can ask me to create an appointment request.")
     print("Type 'exit' to quit the chat.")
 
     while True:
-        user_input = input("\nYou: ")
+        user_input = await ainput("\nYou: ")
         if user_input.lower() == 'exit':
             print("Exiting the chat. Goodbye!")
             break
 
+        prompt = normalize_prompt(user_input)
+        stateless = bool(prompt) and not chat.history
+
         try:
-            response = chat.send_message(user_input)
+            if stateless:
+                cached_text = get_cached_response(prompt)
+                if cached_text is not None:
+                    append_history(chat, user_text(user_input), model_text(cached_text))
+                    print(f"Gemini: {cached_text}")
+                    continue
+                # The opening prompt has no history to send, so its reply can be reused
+                response = await model.generate_content_async(user_input)
+            else:
+                response = await chat.send_message_async(user_input)
 
             if response.candidates and response.candidates[0].content.parts:
-                function_call = None
-                for part in response.candidates[0].content.parts:
-                    if hasattr(part, 'function_call'):
-                        function_call = part.function_call
-                        break
+                model_content = response.candidates[0].content
+                # A stateless call bypassed the chat, so its turn still has to be recorded
+                prior_turns = [user_text(user_input), model_content] if stateless else []
+
+                # function_call is always present on the proto; an empty one has no name
+                function_call = next(
+                    (part.function_call for part in model_content.parts if part.function_call.name),
+                    None
+                )
 
                 if function_call:
                     print(f"\nGemini wants to call function: {function_call.name} with args: {function_call.args}")
 
-                    if function_call.name == "create_appointment_in_fastapi":
-                        tool_response = create_appointment_in_fastapi(**function_call.args)
+                    if function_call.name in TOOL_HANDLERS:
+                        handler, format_reply = TOOL_HANDLERS[function_call.name]
+                        # to_dict turns nested proto args (e.g. the bulk list) into plain JSON values
+                        tool_response = await handler(**type(function_call).to_dict(function_call)["args"])
                         print(f"Tool response from FastAPI: {tool_response}")
 
-                        gemini_final_response = chat.send_message(
-                            genai.protos.Part(
-                                function_response=genai.protos.FunctionResponse(
-                                    name="create_appointment_in_fastapi",
-                                    response=tool_response
+                        # Reply locally instead of a second LLM round trip, then record the
+                        # tool result and reply in the history so later turns keep the context
+                        final_text = format_reply(tool_response)
+                        append_history(
+                            chat,
+                            *prior_turns,
+                            genai.protos.Content(role="user", parts=[
+                                genai.protos.Part(
+                                    function_response=genai.protos.FunctionResponse(
+                                        name=function_call.name,
+                                        response=tool_response
+                                    )
                                 )
-                            )
+                            ]),
+                            model_text(final_text),
                         )
-                        print(f"Gemini: {gemini_final_response.text}")
+                        print(f"Gemini: {final_text}")
                     else:
                         print(f"Error: Unknown function call requested by Gemini: {function_call.name}")
                         print(response.text if response.text else "Gemini did not provide a direct text response.")
                 else:
                     print(f"Gemini: {response.text}")
+                    if stateless:
+                        append_history(chat, *prior_turns)
+                        # Only plain-text answers are cached; tool calls always hit the backend
+                        cache_response(prompt, response.text)
             else:
                 print(f"Gemini: {response.text}")
 
         except Exception as e:
             print(f"An error occurred during Gemini interaction: {e}")
 
+async def main():
+    try:
+        await chat_with_gemini()
+    finally:
+        await _http.aclose()
+
 if __name__ == "__main__":
-    chat_with_gemini()
+    asyncio.run(main())
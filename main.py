@@ -1,21 +1,37 @@
 # main.py
-from fastapi import FastAPI, Path, HTTPException, Query, Depends, status
-from fastapi.responses import JSONResponse
-from pydantic import BaseModel, Field
+from fastapi import FastAPI, Path, HTTPException, Query, Body, Depends, Request, status
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse, StreamingResponse, Response
+from pydantic import BaseModel, Field, field_validator
 from typing import Annotated, Literal
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
 from datetime import datetime, timedelta, timezone
+from zoneinfo import ZoneInfo
+import asyncio
+import hashlib
 import json
+import orjson
+import time
 import os # Keep os for environment variable access
 
 # --- Database Imports ---
-from sqlalchemy import create_engine, Column, String, DateTime
-from sqlalchemy.orm import sessionmaker, declarative_base
-from sqlalchemy.exc import SQLAlchemyError
-from sqlalchemy import UniqueConstraint, func
+from sqlalchemy import Column, String, DateTime, select, update, or_
+from sqlalchemy.orm import declarative_base
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from sqlalchemy import UniqueConstraint, CheckConstraint, Index, func, text
+
+# --- Business Rules ---
+IST = ZoneInfo("Asia/Kolkata")
+BOOKING_WINDOW = timedelta(days=2)  # today plus the next 2 days
+OPENING_HOUR = 9
+CLOSING_HOUR = 19
+BUSINESS_HOURS_ERROR = "Appointment time must be between 9:00 AM and 7:00 PM IST with 0 minutes (on the hour)."
 
 # --- FastAPI App Instance ---
-app = FastAPI()
+app = FastAPI(default_response_class=ORJSONResponse)
+# List payloads repeat the same keys and ISO timestamps, so they compress very well
+app.add_middleware(GZipMiddleware, minimum_size=500, compresslevel=5)
 
 # --- Database Configuration ---
 # DATABASE_URL is expected to be set as an environment variable in the Docker container
@@ -25,9 +41,23 @@ if not DATABASE_URL:
     # This check is still good practice in case the env var isn't set for some reason
     raise ValueError("DATABASE_URL environment variable not set. Please ensure it's configured in docker-compose.yml.")
 
+# The async engine needs the asyncpg driver; accept plain postgresql:// URLs too
+if DATABASE_URL.startswith("postgresql://"):
+    DATABASE_URL = DATABASE_URL.replace("postgresql://", "postgresql+asyncpg://", 1)
+
 # SQLAlchemy setup
-engine = create_engine(DATABASE_URL)
-Session = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+POOL_SIZE = 20
+engine = create_async_engine(
+    DATABASE_URL,
+    pool_size=POOL_SIZE,
+    max_overflow=10,
+    pool_timeout=30,
+    pool_recycle=3600,
+    pool_pre_ping=True,
+    # These are small OLTP queries; Postgres JIT compilation only adds latency to them
+    connect_args={"server_settings": {"jit": "off"}},
+)
+AsyncSessionLocal = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
 Base = declarative_base()
 
 # --- Database Model (SQLAlchemy) ---
@@ -40,160 +70,387 @@ class AppointmentDB(Base):
     appointment_time = Column(DateTime(timezone=True), unique=True, nullable=False)
     status = Column(String, default="pending")
     created_at = Column(DateTime(timezone=True), default=func.now())
-
-    __table_args__ = (UniqueConstraint('appointment_time', name='_appointment_time_uc'),)
+    updated_at = Column(DateTime(timezone=True), default=func.now(), onupdate=func.now())
+
+    __table_args__ = (
+        UniqueConstraint('appointment_time', name='_appointment_time_uc'),
+        # Serves the status-filtered lists ordered by appointment_time
+        Index('ix_appt_status_time', 'status', 'appointment_time'),
+        # Smaller index for the most common listing (pending requests)
+        Index('ix_appt_pending', 'appointment_time', postgresql_where=text("status = 'pending'")),
+        # Serve the ETag aggregates: MAX(updated_at) overall and per status, COUNT(*) per status
+        Index('ix_appt_updated_at', 'updated_at'),
+        Index('ix_appt_status_updated', 'status', 'updated_at'),
+        # Business hours (IST, on the hour) are enforced by the database for every writer;
+        # the booking window is relative to "now", so it stays in the Appoint validator
+        CheckConstraint(
+            "extract(minute from appointment_time AT TIME ZONE 'Asia/Kolkata') = 0 "
+            "AND extract(hour from appointment_time AT TIME ZONE 'Asia/Kolkata') BETWEEN 9 AND 18",
+            name='appt_business_hours'
+        ),
+    )
 
     def __repr__(self):
         return f"<Appointment(id='{self.id}', name='{self.name}', time='{self.appointment_time}', status='{self.status}')>"
 
 # Create database tables
-def create_db_tables():
-    Base.metadata.create_all(bind=engine)
+async def create_db_tables():
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+# Open the pool's connections up front so the first requests don't pay for connecting
+async def warm_db_pool():
+    async def checkout():
+        async with engine.connect():
+            pass
+    await asyncio.gather(*(checkout() for _ in range(POOL_SIZE)))
 
 # Dependency to get a DB session
-def get_db():
-    db = Session()
-    try:
+async def get_db():
+    async with AsyncSessionLocal() as db:
         yield db
-    finally:
-
-        db.close()
 
 # --- Pydantic Model (for request/response validation) ---
 class Appoint(BaseModel):
     id: Annotated[str, Field(..., description='Id of the patient', example='1')]
     name: Annotated[str, Field(..., description='Name of the patient')]
     email: Annotated[str, Field(..., description='Email of the patient', example='jane@example.com')]
-    appointment_time: Annotated[datetime, Field(..., description='Appointment time of the patient', unique=True, example='2025-07-16T10:00:00Z')]
+    appointment_time: Annotated[datetime, Field(..., description='Appointment time of the patient', unique=True, example='2025-07-16T10:00:00+05:30')]
     status: Annotated[Literal['approved', 'rejected', 'pending'], Field('pending', description='Status of the appointment', example='pending')]
 
+    # Business rules are checked here so invalid bookings are rejected before any DB work
+    @field_validator('appointment_time')
+    @classmethod
+    def check_appointment_time(cls, value: datetime) -> datetime:
+        # Times without an offset are taken as IST; everything is checked on the IST wall clock
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=IST)
+        appointment_ist = value.astimezone(IST)
+        today_ist_date = datetime.now(IST).date()
+        if not (today_ist_date <= appointment_ist.date() <= today_ist_date + BOOKING_WINDOW):
+            raise ValueError("Appointment must be for today or within the next 2 days only (inclusive of today).")
+        if not (OPENING_HOUR <= appointment_ist.hour < CLOSING_HOUR and appointment_ist.minute == 0):
+            raise ValueError(BUSINESS_HOURS_ERROR)
+        return value
+
     class Config:
         json_schema_extra = {
             "example": {
                 "id": "1",
                 "name": "John Doe",
                 "email": "john.doe@example.com",
-                "appointment_time": "2025-07-22T10:00:00Z",
+                "appointment_time": "2025-07-22T10:00:00+05:30",
                 "status": "pending"
             }
         }
 
+# --- Response Models ---
+class AppointOut(BaseModel):
+    id: str
+    name: str
+    email: str
+    appointment_time: datetime
+    status: Literal['approved', 'rejected', 'pending']
+    created_at: datetime | None = None
+
+    class Config:
+        from_attributes = True
+
+class AppointmentPage(BaseModel):
+    items: list[AppointOut]
+    next_cursor: str | None = None
+
+class AppointmentResult(BaseModel):
+    message: str
+    appointment_id: str
+
+class BulkAppointmentResult(BaseModel):
+    created: list[str]
+    skipped: list[str]
+
+# --- Read Cache ---
+# Short-lived cache of encoded list pages; writes clear it, so readers see changes at once
+# from this worker and within LIST_CACHE_TTL seconds from any other worker
+LIST_CACHE_TTL = 2.0
+
+class TTLCache:
+    def __init__(self, ttl: float, maxsize: int = 256):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._entries = {}
+        # Bumped by invalidate_all so a page read before a write is never stored after it
+        self.generation = 0
+
+    def get(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expiry, payload = entry
+        if expiry < time.monotonic():
+            self._entries.pop(key, None)
+            return None
+        return payload
+
+    def set(self, key, payload, generation: int):
+        if generation != self.generation:
+            return
+        if len(self._entries) >= self.maxsize:
+            now = time.monotonic()
+            self._entries = {k: v for k, v in self._entries.items() if v[0] >= now}
+            if len(self._entries) >= self.maxsize:
+                self._entries.pop(next(iter(self._entries)))
+        self._entries[key] = (time.monotonic() + self.ttl, payload)
+
+    def invalidate_all(self):
+        self.generation += 1
+        self._entries.clear()
+
+list_cache = TTLCache(LIST_CACHE_TTL)
+
 # --- Startup Event Handler ---
 @app.on_event("startup")
 async def startup_event():
-    create_db_tables()
-    print("Database tables created/checked.")
+    # Production schemas are managed by Alembic (`alembic upgrade head`);
+    # AUTO_CREATE_TABLES=1 keeps the create_all shortcut for local development
+    if os.getenv("AUTO_CREATE_TABLES") == "1":
+        await create_db_tables()
+        print("Database tables created/checked.")
+    await warm_db_pool()
 
-# --- API Endpoints ---
+@app.on_event("shutdown")
+async def shutdown_event():
+    await engine.dispose()
 
-@app.get("/view")
-def view(db: Annotated[Session, Depends(get_db)]):
-    appointments = db.query(AppointmentDB).all()
-    return appointments
+# --- API Endpoints ---
 
-@app.get('/detail/{id}')
-def view_appointment(db: Annotated[Session, Depends(get_db)], id: str = Path(..., description='Id of the Appointment ', examples='1'),
+# Weak ETag for a listing: changes whenever a matching row is added or updated.
+# Unfiltered, MAX(updated_at) alone is enough (the API never deletes, and every insert or
+# status change bumps updated_at) and is a single probe of ix_appt_updated_at.
+# Per status a row can also leave the set without changing its MAX, so COUNT(*) is added;
+# that count is an index-only scan over the status's entries in ix_appt_status_updated.
+async def list_etag(db: AsyncSession, limit: int, cursor: datetime | None, appointment_status: str | None):
+    if appointment_status is None:
+        latest = await db.scalar(select(func.max(AppointmentDB.updated_at)))
+        count = None
+    else:
+        query = select(func.max(AppointmentDB.updated_at), func.count()).where(AppointmentDB.status == appointment_status)
+        latest, count = (await db.execute(query)).one()
+    digest = hashlib.md5(f"{appointment_status}-{limit}-{cursor}-{latest}-{count}".encode()).hexdigest()
+    return f'W/"{digest}"'
+
+def etag_matches(etag: str, if_none_match: str | None) -> bool:
+    if not if_none_match:
+        return False
+    return if_none_match.strip() == '*' or etag in (tag.strip() for tag in if_none_match.split(','))
+
+# Keyset pagination on appointment_time (unique), so every page is a bounded range read.
+# Encoded pages are served from list_cache while fresh, skipping both the query and encoding;
+# otherwise the indexed ETag aggregate (see list_etag) decides whether the client's copy
+# (If-None-Match) is still current.
+async def list_appointments(db: AsyncSession, limit: int, cursor: datetime | None = None, appointment_status: str | None = None,
+                            if_none_match: str | None = None):
+    cache_key = (appointment_status, limit, cursor)
+    cached = list_cache.get(cache_key)
+    if cached is not None:
+        etag, payload = cached
+    else:
+        generation = list_cache.generation
+        etag = await list_etag(db, limit, cursor, appointment_status)
+        if etag_matches(etag, if_none_match):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={'ETag': etag})
+        query = select(AppointmentDB)
+        if appointment_status is not None:
+            query = query.where(AppointmentDB.status == appointment_status)
+        if cursor is not None:
+            query = query.where(AppointmentDB.appointment_time > cursor)
+        result = await db.execute(query.order_by(AppointmentDB.appointment_time).limit(limit))
+        items = result.scalars().all()
+        # UTC 'Z' form so the cursor survives being pasted into a query string unencoded
+        next_cursor = items[-1].appointment_time.astimezone(timezone.utc).isoformat().replace('+00:00', 'Z') if len(items) == limit else None
+        page = AppointmentPage(items=[AppointOut.model_validate(item) for item in items], next_cursor=next_cursor)
+        payload = page.model_dump_json().encode()
+        list_cache.set(cache_key, (etag, payload), generation)
+    if etag_matches(etag, if_none_match):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={'ETag': etag})
+    return Response(content=payload, media_type='application/json', headers={'ETag': etag})
+
+@app.get("/view", response_model=AppointmentPage)
+async def view(request: Request, db: Annotated[AsyncSession, Depends(get_db)],
+               limit: int = Query(50, ge=1, le=200, description='Maximum number of appointments to return'),
+               cursor: datetime | None = Query(None, description='appointment_time of the last item from the previous page')):
+    return await list_appointments(db, limit, cursor, if_none_match=request.headers.get('if-none-match'))
+
+@app.get('/appointments', response_model=AppointmentPage)
+async def get_appointments_by_status(request: Request, db: Annotated[AsyncSession, Depends(get_db)],
+                                     status: Literal['approved', 'rejected', 'pending'] = Query(..., description='Status of the appointments to list', examples='pending'),
+                                     limit: int = Query(50, ge=1, le=200, description='Maximum number of appointments to return'),
+                                     cursor: datetime | None = Query(None, description='appointment_time of the last item from the previous page')):
+    return await list_appointments(db, limit, cursor, status, request.headers.get('if-none-match'))
+
+# Full listing streamed row by row, for clients that need everything rather than pages.
+# The generator opens its own session because dependencies are closed before streaming starts.
+async def stream_appointments(appointment_status: str | None = None):
+    query = select(AppointmentDB).order_by(AppointmentDB.appointment_time).execution_options(yield_per=500)
+    if appointment_status is not None:
+        query = query.where(AppointmentDB.status == appointment_status)
+    async with AsyncSessionLocal() as db:
+        rows = await db.stream_scalars(query)
+        yield b'['
+        first = True
+        async for row in rows:
+            if not first:
+                yield b','
+            first = False
+            yield orjson.dumps({
+                'id': row.id,
+                'name': row.name,
+                'email': row.email,
+                'appointment_time': row.appointment_time,
+                'status': row.status,
+                'created_at': row.created_at,
+            })
+        yield b']'
+
+@app.get('/export')
+async def export_appointments(status: Literal['approved', 'rejected', 'pending'] | None = Query(None, description='Only export appointments with this status')):
+    return StreamingResponse(stream_appointments(status), media_type='application/json')
+
+@app.get('/detail/{id}', response_model=AppointOut)
+async def view_appointment(db: Annotated[AsyncSession, Depends(get_db)], id: str = Path(..., description='Id of the Appointment ', examples='1'),
                     ):
-    appointment = db.query(AppointmentDB).filter(AppointmentDB.id == id).first()
+    result = await db.execute(select(AppointmentDB).where(AppointmentDB.id == id))
+    appointment = result.scalar_one_or_none()
     if appointment:
         return appointment
     raise HTTPException(status_code=404, detail='No appointment found with this id')
 
-@app.post("/create")
-def create_appointment(new_appoint: Appoint, db: Annotated[Session,Depends(get_db)]):
-    # CHECK IF APPOINTMENT ID ALREADY EXISTS
-    existing_by_id = db.query(AppointmentDB).filter(AppointmentDB.id == new_appoint.id).first()
-    if existing_by_id:
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f'Appointment with ID {new_appoint.id} already exists')
-
-   
-   
-    # Get current time in UTC and adjust to IST for business logic
-    current_utc_time = datetime.now(timezone.utc)
-    ist_offset = timedelta(hours=5, minutes=30)
-    current_ist_time = current_utc_time + ist_offset
-
-    today_ist_date = current_ist_time.date()
-
-    appointment_dt_ist = new_appoint.appointment_time
-    appointment_date = appointment_dt_ist.date()
-
-    latest_allowed_date = today_ist_date + timedelta(days=2)
-
-    new_appointment_time_utc = new_appoint.appointment_time
-     # CHECK IF APPOINTMENT TIME ALREADY EXISTS
-    existing_by_time = db.query(AppointmentDB).filter(AppointmentDB.appointment_time == new_appointment_time_utc).first()
-    if existing_by_time:
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail='Appointment time already exists')
-
-    # Validate appointment date is today or within the next 2 days
-    if not (today_ist_date <= appointment_date <= latest_allowed_date):
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Appointment must be for today or within the next 2 days only (inclusive of today).")
-    # Validate appointment time is on the hour and within business hours
-    if not (9 <= appointment_dt_ist.hour < 19 and appointment_dt_ist.minute == 0):
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Appointment time must be between 9:00 AM and 7:00 PM with 0 minutes (on the hour).")
-
-    db_appointment = AppointmentDB(
-        id=new_appoint.id,
-        name=new_appoint.name,
-        email=new_appoint.email,
-        appointment_time=new_appointment_time_utc,
-        status=new_appoint.status,
-        created_at=current_ist_time
+@app.post("/create", response_model=AppointmentResult)
+async def create_appointment(new_appoint: Appoint, db: Annotated[AsyncSession, Depends(get_db)]):
+    # Insert in one statement; the primary key and unique time constraint reject duplicates
+    stmt = (
+        pg_insert(AppointmentDB)
+        .values(
+            id=new_appoint.id,
+            name=new_appoint.name,
+            email=new_appoint.email,
+            appointment_time=new_appoint.appointment_time,
+            status=new_appoint.status,
+            created_at=datetime.now(IST)
+        )
+        .on_conflict_do_nothing()
+        .returning(AppointmentDB.id)
     )
 
     try:
-        db.add(db_appointment)
-        db.commit()
-        db.refresh(db_appointment)
-        return JSONResponse(status_code=status.HTTP_200_OK, content={'message': 'Appointment created successfully', 'appointment_id': db_appointment.id})
+        result = await db.execute(stmt)
+        created_id = result.scalar_one_or_none()
+        if created_id is not None:
+            await db.commit()
+            list_cache.invalidate_all()
+            return AppointmentResult(message='Appointment created successfully', appointment_id=created_id)
+
+        # Nothing inserted: find out whether the id or the time slot is taken
+        result = await db.execute(
+            select(AppointmentDB.id)
+            .where(or_(AppointmentDB.id == new_appoint.id, AppointmentDB.appointment_time == new_appoint.appointment_time))
+            .limit(2)
+        )
+        existing_ids = result.scalars().all()
+        await db.rollback()
+    except IntegrityError as e:
+        await db.rollback()
+        if 'appt_business_hours' in str(e.orig):
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=BUSINESS_HOURS_ERROR)
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=f"Database error: {e}")
     except SQLAlchemyError as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=f"Database error: {e}")
     except Exception as e:
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=f"An unexpected error occurred: {e}")
 
+    if new_appoint.id in existing_ids:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f'Appointment with ID {new_appoint.id} already exists')
+    raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail='Appointment time already exists')
+
+
+@app.post("/create_bulk", response_model=BulkAppointmentResult)
+async def create_appointments_bulk(new_appoints: Annotated[list[Appoint], Body(..., min_length=1, max_length=50)],
+                                   db: Annotated[AsyncSession, Depends(get_db)]):
+    # ON CONFLICT would keep only one of several items sharing an id, and skipped is reported per id
+    ids = [appoint.id for appoint in new_appoints]
+    duplicate_ids = sorted({id for id in ids if ids.count(id) > 1})
+    if duplicate_ids:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Duplicate appointment IDs in request: {', '.join(duplicate_ids)}")
+
+    # One multi-row INSERT; rows whose id or time slot is taken are skipped rather than failing the batch
+    created_at = datetime.now(IST)
+    stmt = (
+        pg_insert(AppointmentDB)
+        .values([{**appoint.model_dump(), 'created_at': created_at} for appoint in new_appoints])
+        .on_conflict_do_nothing()
+        .returning(AppointmentDB.id)
+    )
+
+    try:
+        result = await db.execute(stmt)
+        created_ids = result.scalars().all()
+        await db.commit()
+    except IntegrityError as e:
+        await db.rollback()
+        if 'appt_business_hours' in str(e.orig):
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=BUSINESS_HOURS_ERROR)
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=f"Database error: {e}")
+    except SQLAlchemyError as e:
+        await db.rollback()
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=f"Database error: {e}")
 
-@app.put('/accept/{id}')
-def accept_appointment(db: Annotated[Session, Depends(get_db)], id: str = Path(..., description='Id of the Appointment to accept', examples='1'),
+    if created_ids:
+        list_cache.invalidate_all()
+    created = set(created_ids)
+    return BulkAppointmentResult(created=created_ids, skipped=[appoint.id for appoint in new_appoints if appoint.id not in created])
+
+# Single UPDATE ... RETURNING id instead of loading the row first; None means no such appointment
+async def update_appointment_status(db: AsyncSession, id: str, new_status: str):
+    try:
+        result = await db.execute(
+            update(AppointmentDB).where(AppointmentDB.id == id).values(status=new_status).returning(AppointmentDB.id)
+        )
+        updated_id = result.scalar_one_or_none()
+        await db.commit()
+        if updated_id is not None:
+            list_cache.invalidate_all()
+        return updated_id
+    except SQLAlchemyError as e:
+        await db.rollback()
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=f"Database error: {e}")
+
+@app.put('/accept/{id}', response_model=AppointmentResult)
+async def accept_appointment(db: Annotated[AsyncSession, Depends(get_db)], id: str = Path(..., description='Id of the Appointment to accept', examples='1'),
                        ):
-    appointment = db.query(AppointmentDB).filter(AppointmentDB.id == id).first()
-    if appointment:
-        appointment.status = 'approved'
-        try:
-            db.commit()
-            db.refresh(appointment)
-            return JSONResponse(status_code=status.HTTP_200_OK, content={'message': 'Appointment accepted successfully', 'appointment_id': appointment.id})
-        except SQLAlchemyError as e:
-            db.rollback()
-            raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=f"Database error: {e}")
-    raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail='No appointment found with this id')
-
-@app.put('/reject/{id}')
-def reject_appointment(db: Annotated[Session, Depends(get_db)], id: str = Path(..., description='Id of the Appointment to reject', examples='1')):
-    appointment = db.query(AppointmentDB).filter(AppointmentDB.id == id).first()
-    if appointment:
-        appointment.status = 'rejected'
-        try:
-            db.commit()
-            db.refresh(appointment)
-            return JSONResponse(status_code=status.HTTP_200_OK, content={'message': 'Appointment rejected successfully', 'appointment_id': appointment.id})
-        except SQLAlchemyError as e:
-            db.rollback()
-            raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=f"Database error: {e}")
-    raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail='No appointment found with this id')
-
-@app.get('/pending')
-def get_pending_appointments(db: Annotated[Session, Depends(get_db)]):
-    pending_appointments = db.query(AppointmentDB).filter(AppointmentDB.status == 'pending').all()
-    return pending_appointments
-
-@app.get('/approved')
-def get_approved_appointments(db: Annotated[Session, Depends(get_db)]):
-    approved_appointments = db.query(AppointmentDB).filter(AppointmentDB.status == 'approved').all()
-    return approved_appointments
-
-@app.get('/rejected')
-def get_rejected_appointments(db: Annotated[Session, Depends(get_db)]):
-    rejected_appointments = db.query(AppointmentDB).filter(AppointmentDB.status == 'rejected').all()
-    return rejected_appointments
+    updated_id = await update_appointment_status(db, id, 'approved')
+    if updated_id is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail='No appointment found with this id')
+    return AppointmentResult(message='Appointment accepted successfully', appointment_id=updated_id)
+
+@app.put('/reject/{id}', response_model=AppointmentResult)
+async def reject_appointment(db: Annotated[AsyncSession, Depends(get_db)], id: str = Path(..., description='Id of the Appointment to reject', examples='1')):
+    updated_id = await update_appointment_status(db, id, 'rejected')
+    if updated_id is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail='No appointment found with this id')
+    return AppointmentResult(message='Appointment rejected successfully', appointment_id=updated_id)
+
+# Kept for existing clients; these are thin aliases over /appointments?status=...
+@app.get('/pending', response_model=AppointmentPage)
+async def get_pending_appointments(request: Request, db: Annotated[AsyncSession, Depends(get_db)],
+                                   limit: int = Query(50, ge=1, le=200), cursor: datetime | None = None):
+    return await list_appointments(db, limit, cursor, 'pending', request.headers.get('if-none-match'))
+
+@app.get('/approved', response_model=AppointmentPage)
+async def get_approved_appointments(request: Request, db: Annotated[AsyncSession, Depends(get_db)],
+                                    limit: int = Query(50, ge=1, le=200), cursor: datetime | None = None):
+    return await list_appointments(db, limit, cursor, 'approved', request.headers.get('if-none-match'))
+
+@app.get('/rejected', response_model=AppointmentPage)
+async def get_rejected_appointments(request: Request, db: Annotated[AsyncSession, Depends(get_db)],
+                                    limit: int = Query(50, ge=1, le=200), cursor: datetime | None = None):
+    return await list_appointments(db, limit, cursor, 'rejected', request.headers.get('if-none-match'))